@@ -0,0 +1,132 @@
+"""Contains the file input and output functions shared by
+flow_processing_input and flow_processed_output.
+
+Functions:
+    create_file: Opens a file for binary writing, replacing existing files
+        atomically.
+    open_for_export: Opens a file for binary writing, optionally
+        gzip-compressed.
+    open_for_import: Opens a file for binary reading, decompressing it if
+        compressed.
+    write_to_file: Writes a header followed by data to a file.
+    read_from_file: Reads the contents of a file.
+    is_list_of: Checks whether data is a list of a given type.
+"""
+
+import bz2
+import contextlib
+import gzip
+import os
+import stat
+import tempfile
+import warnings
+
+# First bytes of gzip-compressed files, and of bz2-compressed files written
+# by older exports of flow_processed_output
+_GZIP_MAGIC = b'\x1f\x8b'
+_BZ2_MAGIC = b'BZh'
+
+
+@contextlib.contextmanager
+def create_file(filepath: str, buffering: int = -1):
+    """Opens filepath for binary writing.
+
+    The file is created exclusively, so that no separate existence check is
+    needed when the file is new. Warns the user if a file already exists at
+    filepath and overwrites it by replacing it with a uniquely named
+    temporary file in the same directory, so that the existing file is never
+    left partially written.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    try:
+        fd = os.open(filepath, flags, 0o666)
+    except FileExistsError:
+        warnings.warn('File already exists at filepath. Overwriting file.')
+    else:
+        with os.fdopen(fd, 'wb', buffering=buffering) as file:
+            yield file
+        return
+    fd, temp_filepath = tempfile.mkstemp(
+        suffix='.tmp', prefix=os.path.basename(filepath) + '.',
+        dir=os.path.dirname(filepath) or os.curdir)
+    try:
+        # Keep the permissions of the file being replaced
+        with contextlib.suppress(OSError):
+            os.chmod(temp_filepath, stat.S_IMODE(os.stat(filepath).st_mode))
+        with os.fdopen(fd, 'wb', buffering=buffering) as file:
+            yield file
+        os.replace(temp_filepath, filepath)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temp_filepath)
+        raise
+
+
+@contextlib.contextmanager
+def open_for_export(filepath: str, compress: bool, buffering: int = -1):
+    """Opens filepath for binary writing, gzip-compressing the data if
+    compress.
+
+    Warns the user if a file already exists at filepath and replaces it
+    once the data is written.
+    """
+    with create_file(filepath, buffering) as file:
+        if compress:
+            # The fastest level, as exports are limited by bytes written
+            with gzip.GzipFile(fileobj=file, mode='wb',
+                               compresslevel=1) as compressed_file:
+                yield compressed_file
+        else:
+            yield file
+
+
+@contextlib.contextmanager
+def open_for_import(filepath: str, buffering: int = -1):
+    """Opens filepath for binary reading, decompressing it if gzip- or
+    bz2-compressed.
+
+    Yields the file together with whether it is compressed. Uncompressed
+    files are yielded as the opened file itself, so that they can be
+    accessed through their file descriptor.
+    """
+    with open(filepath, 'rb', buffering=buffering) as file:
+        magic = file.read(len(_BZ2_MAGIC))
+        file.seek(0)
+        if magic.startswith(_GZIP_MAGIC):
+            with gzip.GzipFile(fileobj=file, mode='rb') as compressed_file:
+                yield compressed_file, True
+        elif magic.startswith(_BZ2_MAGIC):
+            with bz2.BZ2File(file, 'rb') as compressed_file:
+                yield compressed_file, True
+        else:
+            yield file, False
+
+
+def write_to_file(filepath: str, header: bytes, data: bytes,
+                  compress: bool):
+    """Writes header followed by data to filepath, gzip-compressing them if
+    compress."""
+    with open_for_export(filepath, compress) as file:
+        file.write(header)
+        file.write(data)
+
+
+def read_from_file(filepath: str) -> bytes:
+    """Reads the contents of filepath, decompressing them if the file is
+    compressed."""
+    # Unbuffered read() sizes one buffer from the file size up front
+    with open_for_import(filepath, buffering=0) as (file, _):
+        return file.read()
+
+
+def is_list_of(data, item_type: type) -> bool:
+    """Checks whether data is a list of item_type.
+
+    Only the first, middle and last items are checked, so that the cost
+    does not grow with the length of data. An empty list passes.
+    """
+    if not isinstance(data, list):
+        return False
+    middle = len(data) // 2
+    sample = data[:1] + data[middle:middle + 1] + data[-1:]
+    return all(isinstance(item, item_type) for item in sample)
@@ -0,0 +1,107 @@
+"""Contains test cases for flow_file_io.py.
+
+Classes:
+    testFlowFileIO: Test cases for the functions of flow_file_io.
+
+To run all test cases, use the following command:
+    >>> python3 flow_file_io_test.py
+"""
+
+import bz2
+import os
+import tempfile
+import unittest
+import warnings
+
+import flow_file_io
+
+
+class testFlowFileIO(unittest.TestCase):
+    """Test the file input and output functions in flow_file_io.py.
+
+    This is done by checking that data written to a file is read back
+    unchanged, whether compressed or not, and that existing files are
+    replaced with a warning.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a temporary directory for the files of all test cases."""
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        cls.dir = cls._temp_dir.name
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the temporary directory and the files in it."""
+        cls._temp_dir.cleanup()
+
+    def test_read_equals_write(self):
+        """Verify that read_from_file() returns the header and data written
+        by write_to_file(), with and without compression."""
+        for compress in (False, True):
+            filepath = os.path.join(self.dir, f'1_{compress}.txt')
+            flow_file_io.write_to_file(filepath, b'HEAD', b'data', compress)
+            self.assertEqual(flow_file_io.read_from_file(filepath),
+                             b'HEADdata')
+
+    def test_open_for_import_reports_compression(self):
+        """Verify that open_for_import() reports whether the file is
+        compressed."""
+        filepath = os.path.join(self.dir, '2.txt')
+        flow_file_io.write_to_file(filepath, b'HEAD', b'data', False)
+        with flow_file_io.open_for_import(filepath) as (file, compressed):
+            self.assertFalse(compressed)
+            self.assertEqual(file.read(), b'HEADdata')
+        filepath = os.path.join(self.dir, '3.txt')
+        flow_file_io.write_to_file(filepath, b'HEAD', b'data', True)
+        with flow_file_io.open_for_import(filepath) as (file, compressed):
+            self.assertTrue(compressed)
+            self.assertEqual(file.read(), b'HEADdata')
+        filepath = os.path.join(self.dir, '4.txt')
+        with open(filepath, 'wb') as file:
+            file.write(bz2.compress(b'HEADdata'))
+        with flow_file_io.open_for_import(filepath) as (file, compressed):
+            self.assertTrue(compressed)
+            self.assertEqual(file.read(), b'HEADdata')
+
+    def test_create_file_overwrites_file(self):
+        """Verify that create_file() warns the user and replaces the file
+        if it already exists."""
+        filepath = os.path.join(self.dir, '5.txt')
+        with flow_file_io.create_file(filepath) as file:
+            file.write(b'old data')
+        with self.assertWarns(Warning):
+            with flow_file_io.create_file(filepath) as file:
+                file.write(b'new')
+        with open(filepath, 'rb') as file:
+            self.assertEqual(file.read(), b'new')
+        # Check that no temporary file is left behind
+        self.assertEqual([name for name in os.listdir(self.dir)
+                          if name.startswith('5.txt')], ['5.txt'])
+
+    def test_create_file_keeps_file_on_error(self):
+        """Verify that create_file() leaves an existing file unchanged if
+        writing the new file fails."""
+        filepath = os.path.join(self.dir, '6.txt')
+        with flow_file_io.create_file(filepath) as file:
+            file.write(b'old data')
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            with self.assertRaises(RuntimeError):
+                with flow_file_io.create_file(filepath) as file:
+                    file.write(b'new')
+                    raise RuntimeError
+        with open(filepath, 'rb') as file:
+            self.assertEqual(file.read(), b'old data')
+
+    def test_is_list_of(self):
+        """Verify that is_list_of() accepts lists of the given type,
+        including empty lists, and rejects anything else."""
+        self.assertTrue(flow_file_io.is_list_of([], int))
+        self.assertTrue(flow_file_io.is_list_of([1, 2, 3], int))
+        self.assertFalse(flow_file_io.is_list_of([1, 'a', 3], int))
+        self.assertFalse(flow_file_io.is_list_of((1, 2, 3), int))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,27 +10,55 @@ Classes:
 
 #modifed test
 
-import datetime
+from array import array
+from dataclasses import dataclass
+import mmap
+from flow_file_io import is_list_of, open_for_export, open_for_import
 from flow_processing_input import DetectorId, SectionId
-from os import path
 import pickle
+import struct
 from typing import Dict, List
 import warnings
 
-
+# Files written by DetectorIdToRoadSections.export_to_file start with these
+# magic bytes, followed by the pickle stream.
+_DITRS_MAGIC = b'DITRS\x01'
+# Files written by OutputFlowDataSet.export_to_file start with this header:
+# magic bytes, length of the pickle stream and number of out-of-band buffers.
+# The buffer lengths (unsigned 64-bit each), the pickle stream and the raw
+# buffers follow in that order.
+_OFDS_MAGIC = b'OFDS\x01'
+_OFDS_HEADER = struct.Struct('<5sQI')
+# Buffer size for exported files, so pickle output reaches the OS in large
+# sequential writes.
+_WRITE_BUFFER_SIZE = 1 << 20
+
+
+@dataclass(frozen=True)
 class DetectorIdToRoadSection:
     """Data class for one DetectorId to SectionId.
 
     The object corresponds to data of the detectorID and sectionID
-    from one detector.
+    from one detector. Instances are immutable.
 
     Attributes:
         detector_id: ID of the detector.
         section_id: ID of the detector's section.
     """
+    __slots__ = ('detector_id', 'section_id')
     detector_id: DetectorId
     section_id: SectionId
 
+    def __reduce__(self):
+        """Pickles the object as a constructor call on its attributes."""
+        return (DetectorIdToRoadSection, (self.detector_id, self.section_id))
+
+    def __setstate__(self, state: Dict):
+        """Restores the attributes of objects pickled before
+        DetectorIdToRoadSection was a data class."""
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
 
 class DetectorIdToRoadSections:
     """Data class for multiple DetectorId to SectionId pairs.
@@ -48,14 +76,19 @@ class DetectorIdToRoadSections:
     Attributes:
         aimsun_detector_locations: List of DetectorIdToRoadSection
             from multiple detectors.
+        detector_ids: int64 array of the detector IDs in
+            aimsun_detector_locations, built on every access.
+        section_ids: int64 array of the section IDs in
+            aimsun_detector_locations, built on every access.
     """
+    __slots__ = ('aimsun_detector_locations',)
     aimsun_detector_locations: List[DetectorIdToRoadSection]
 
     def __init__(self, filepath: str = ""):
         if filepath:
             self._import_from_file(filepath)
 
-    def export_to_file(self, filepath: str):
+    def export_to_file(self, filepath: str, compress: bool = False):
         """Export DetectorIdToRoadSections to file by serializing
         `aimsun_detector_locations`.
 
@@ -64,69 +97,180 @@ class DetectorIdToRoadSections:
 
         Args:
             filepath: Location to export object attributes.
+            compress: Whether to gzip-compress the exported file.
         """
         # Check if aimsun_detector_locations is empty
         if len(self.aimsun_detector_locations) == 0:
             raise Exception('DetectorIdToRoadSections has no data.'
                             + 'Export aborted.')
-        # Check if file exists at given filepath
-        if path.exists(filepath):
-            warnings.warn('File already exists at filepath. Overwriting file.')
-        # Serialize aimsun_detector_locations and write to filepath
-        with open(filepath, 'wb') as file:
-            pickle.dump(self.aimsun_detector_locations, file)
+        # Serialize aimsun_detector_locations
+        data = pickle.dumps(self.aimsun_detector_locations,
+                            protocol=pickle.HIGHEST_PROTOCOL,
+                            fix_imports=False)
+        # Write serialized aimsun_detector_locations to filepath
+        with open_for_export(filepath, compress,
+                             _WRITE_BUFFER_SIZE) as file:
+            file.write(_DITRS_MAGIC)
+            file.write(data)
 
     def _import_from_file(self, filepath: str):
         """Import DetectorIdToRoadSections from file by deserializing
         `aimsun_detector_locations`.
 
         Raises exception if the given file does not match the data type of
-        aimsun_detector_locations (List[DetectorIdToRoadSection]).
+        aimsun_detector_locations (List[DetectorIdToRoadSection]). The data
+        type is only checked for files without the header written by
+        export_to_file. Compressed files are decompressed transparently.
 
         Args:
             filepath: Location to import object attributes from.
         """
         # Deserialize aimsun_detector_locations from filepath
-        with open(filepath, 'rb') as file:
+        with open_for_import(filepath) as (file, _):
+            exported = file.read(len(_DITRS_MAGIC)) == _DITRS_MAGIC
+            if not exported:
+                # Files exported without a header are a plain pickle stream
+                file.seek(0)
             imported_aimsun_detector_locations = pickle.load(file)
-        # Check if imported data matches data type of flow_data_set
-        if (isinstance(imported_aimsun_detector_locations, list)
-                and isinstance(imported_aimsun_detector_locations[0],
-                               DetectorIdToRoadSection)):
+        # Check if imported data matches data type of
+        # aimsun_detector_locations, unless written by export_to_file
+        if exported or is_list_of(imported_aimsun_detector_locations,
+                                  DetectorIdToRoadSection):
             self.aimsun_detector_locations = imported_aimsun_detector_locations
         else:
             raise Exception("File has incorrect data type. Import aborted.")
 
-    def __eq__(self, other):
-        """Evaluates object equality based on attributes."""
-        # Check if length of aimsun_detector_locations equals each other
-        if (len(self.aimsun_detector_locations)
-                != len(other.aimsun_detector_locations)):
-            return False
-        # Check all attributes of aimsun_detector_locations against each other
-        for i in range(len(self.aimsun_detector_locations)):
-            selfVals = self.aimsun_detector_locations[i]
-            otherVals = other.aimsun_detector_locations[i]
-            if (selfVals.detector_id != otherVals.detector_id
-                    or selfVals.section_id != otherVals.section_id):
-                return False
-        return True
+    @property
+    def detector_ids(self) -> array:
+        """IDs of the detectors in aimsun_detector_locations (int64)."""
+        return array('q', [location.detector_id
+                           for location in self.aimsun_detector_locations])
 
+    @property
+    def section_ids(self) -> array:
+        """IDs of the sections in aimsun_detector_locations (int64)."""
+        return array('q', [location.section_id
+                           for location in self.aimsun_detector_locations])
 
+    def __eq__(self, other):
+        """Evaluates object equality based on attributes."""
+        # Check the length, then all attributes of aimsun_detector_locations
+        # against each other, stopping at the first difference
+        return (len(self.aimsun_detector_locations)
+                == len(other.aimsun_detector_locations)
+                and all(this.detector_id == that.detector_id
+                        and this.section_id == that.section_id
+                        for this, that
+                        in zip(self.aimsun_detector_locations,
+                               other.aimsun_detector_locations)))
+
+
+@dataclass(frozen=True)
 class OutputFlowData:
     """Data class for output flow data from one detector.
 
+    The flow data is stored as two parallel arrays, so that it is kept in
+    contiguous memory and pickled as two buffers. Instances are immutable,
+    but the arrays themselves are not and should be left unchanged.
+
     Attributes:
         detector_id: ID of the detector.
-        flow_data: Flow data of the detector.
+        flows: Flow sizes of the detector (float32), one per time.
         section_id: ID of the detector's section.
+        times: Times of the detector's flows (int64), in seconds since
+            midnight.
     """
+    __slots__ = ('detector_id', 'flows', 'section_id', 'times')
     detector_id: DetectorId
-    flow_data: Dict[datetime.time, float]
+    flows: array
     section_id: SectionId
+    times: array
+
+    def __reduce_ex__(self, protocol):
+        """Pickles times and flows as contiguous buffers.
+
+        From protocol 5 onwards both arrays are handed to the pickler as
+        PickleBuffers, so they can be written out-of-band, together with
+        their typecodes. Older protocols pickle the object as a constructor
+        call on its attributes.
+        """
+        if protocol < 5:
+            return (OutputFlowData, (self.detector_id, self.flows,
+                                     self.section_id, self.times))
+        return (_rebuild_output_flow_data,
+                (self.detector_id, self.section_id,
+                 pickle.PickleBuffer(self.times),
+                 pickle.PickleBuffer(self.flows),
+                 self.times.typecode, self.flows.typecode))
+
+    def __setstate__(self, state: Dict):
+        """Restores the attributes of objects pickled before OutputFlowData
+        was a data class.
+
+        Their flow_data dictionary of datetime.time to flow size is
+        converted to times and flows. Parts of a second are dropped, and
+        flow sizes are rounded to single precision, each with a warning.
+        """
+        flow_data = state.pop('flow_data', None)
+        if flow_data is not None:
+            if any(time.microsecond for time in flow_data):
+                warnings.warn('Flow data times have fractions of a second. '
+                              + 'Dropping them.')
+            state['times'] = array('q', [time.hour * 3600 + time.minute * 60
+                                         + time.second
+                                         for time in flow_data])
+            state['flows'] = array('f', flow_data.values())
+            if state['flows'].tolist() != list(flow_data.values()):
+                warnings.warn('Flow data flow sizes exceed single precision. '
+                              + 'Rounding them.')
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+
+def _rebuild_output_flow_data(detector_id: DetectorId, section_id: SectionId,
+                              times, flows, times_typecode: str = 'q',
+                              flows_typecode: str = 'f') -> OutputFlowData:
+    """Rebuilds an OutputFlowData pickled by OutputFlowData.__reduce_ex__.
+
+    Objects pickled before the typecodes were included hold 'q' times and
+    'f' flows.
+    """
+    times_array = array(times_typecode)
+    times_array.frombytes(times)
+    flows_array = array(flows_typecode)
+    flows_array.frombytes(flows)
+    return OutputFlowData(detector_id=detector_id, flows=flows_array,
+                          section_id=section_id, times=times_array)
+
+
+def _loads_flow_data_set(view: memoryview) -> list:
+    """Deserializes flow_data_set from the contents of an exported file.
+
+    The pickle stream and the out-of-band buffers are passed to the
+    unpickler as slices of view, without copying them first. The slices
+    are released before returning.
+
+    Args:
+        view: Contents of a file written by OutputFlowDataSet.export_to_file.
+    """
+    _, data_length, num_buffers = _OFDS_HEADER.unpack_from(view)
+    lengths_format = f'<{num_buffers}Q'
+    buffer_lengths = struct.unpack_from(lengths_format, view,
+                                        _OFDS_HEADER.size)
+    offset = _OFDS_HEADER.size + struct.calcsize(lengths_format)
+    slices = []
+    for length in (data_length,) + buffer_lengths:
+        slices.append(view[offset:offset + length])
+        offset += length
+    try:
+        if offset != len(view):
+            raise Exception("File has incorrect length. Import aborted.")
+        return pickle.loads(slices[0], buffers=slices[1:])
+    finally:
+        for view_slice in slices:
+            view_slice.release()
 
 
-# TODO(Theo): check if we need the year attribute
 class OutputFlowDataSet:
     """Data class for output flow data from multiple detectors.
 
@@ -142,51 +286,80 @@ class OutputFlowDataSet:
 
     Attributes:
         flow_data_set: List of OutputFlowData.
-        year: Year data was collected.
     """
+    __slots__ = ('flow_data_set',)
     flow_data_set: List[OutputFlowData]
-    year: int
 
     def __init__(self, filepath: str = ""):
         if filepath:
             self._import_from_file(filepath)
 
-    def export_to_file(self, filepath: str):
-        """Export OutputFlowDataSet to file by serializing `flow_data_set`
-        and `year`.
+    def export_to_file(self, filepath: str, compress: bool = False):
+        """Export OutputFlowDataSet to file by serializing `flow_data_set`.
+
+        The times and flows of every OutputFlowData are written as raw
+        out-of-band buffers after the pickle stream, see `_OFDS_HEADER`.
 
         Raises exception if the detectors_location_dict is empty. Warns the
         user if a file already exists at filepath and overwrites it.
 
         Args:
             filepath: Location to export object attributes.
+            compress: Whether to gzip-compress the exported file.
         """
         # Check if flow_data_set is empty
         if len(self.flow_data_set) == 0:
             raise Exception('OutputFlowDataSet has no data. Export aborted.')
-        # Check if file exists at given filepath
-        if path.exists(filepath):
-            warnings.warn('File already exists at filepath. Overwriting file.')
-        # Serialize flow_data_set and write to filepath
-        with open(filepath, 'wb') as file:
-            pickle.dump(self.flow_data_set, file)
+        # Serialize flow_data_set, keeping times and flows out-of-band
+        buffers = []
+        data = pickle.dumps(self.flow_data_set,
+                            protocol=pickle.HIGHEST_PROTOCOL,
+                            fix_imports=False,
+                            buffer_callback=buffers.append)
+        raw_buffers = [buffer.raw() for buffer in buffers]
+        # Write header, pickle stream and buffers to filepath
+        with open_for_export(filepath, compress,
+                             _WRITE_BUFFER_SIZE) as file:
+            file.write(_OFDS_HEADER.pack(_OFDS_MAGIC, len(data),
+                                         len(raw_buffers)))
+            file.write(struct.pack(f'<{len(raw_buffers)}Q',
+                                   *(raw.nbytes for raw in raw_buffers)))
+            file.write(data)
+            for raw in raw_buffers:
+                file.write(raw)
 
     def _import_from_file(self, filepath: str):
-        """Import OutputFlowDataSet from file by deserializing `flow_data_set`
-        and `year`.
+        """Import OutputFlowDataSet from file by deserializing
+        `flow_data_set`.
 
         Raises exception if the given file does not match the data type of
-        flow_data_set (List[OutputFlowData]) and year (int).
+        flow_data_set (List[OutputFlowData]). The data type is only checked
+        for files without the header written by export_to_file.
+        Compressed files are decompressed transparently.
 
         Args:
             filepath: Location to import object attributes from.
         """
         # Deserialize flow_data_set from filepath
-        with open(filepath, 'rb') as file:
-            imported_flow_data_set = pickle.load(file)
-        # Check if imported data matches data type of flow_data_set
-        if (isinstance(imported_flow_data_set, list)
-                and isinstance(imported_flow_data_set[0], OutputFlowData)):
+        with open_for_import(filepath) as (file, compressed):
+            exported = file.read(len(_OFDS_MAGIC)) == _OFDS_MAGIC
+            if not exported:
+                # Files exported without a header are a plain pickle stream
+                file.seek(0)
+                imported_flow_data_set = pickle.load(file)
+            elif not compressed:
+                # Map uncompressed files, so that the buffers are copied
+                # straight from the mapped pages
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                with mapped, memoryview(mapped) as view:
+                    imported_flow_data_set = _loads_flow_data_set(view)
+            else:
+                file.seek(0)
+                imported_flow_data_set = _loads_flow_data_set(
+                    memoryview(file.read()))
+        # Check if imported data matches data type of flow_data_set, unless
+        # written by export_to_file
+        if exported or is_list_of(imported_flow_data_set, OutputFlowData):
             self.flow_data_set = imported_flow_data_set
         else:
             raise Exception("File has incorrect data type. Import aborted.")
@@ -204,15 +377,12 @@ class OutputFlowDataSet:
 
     def __eq__(self, other):
         """Evaluates object equality based on attributes."""
-        # Check if length of flow_data_set equals each other
-        if len(self.flow_data_set) != len(other.flow_data_set):
-            return False
-        # Check all attributes of flow_data_set against each other
-        for i in range(len(self.flow_data_set)):
-            selfVals = self.flow_data_set[i]
-            otherVals = other.flow_data_set[i]
-            if (selfVals.detector_id != otherVals.detector_id
-                    or selfVals.flow_data != otherVals.flow_data
-                    or selfVals.section_id != otherVals.section_id):
-                return False
-        return True
+        # Check the length, then all attributes of flow_data_set against
+        # each other, stopping at the first difference
+        return (len(self.flow_data_set) == len(other.flow_data_set)
+                and all(this.detector_id == that.detector_id
+                        and this.section_id == that.section_id
+                        and this.times == that.times
+                        and this.flows == that.flows
+                        for this, that
+                        in zip(self.flow_data_set, other.flow_data_set)))
@@ -12,13 +12,18 @@ To run all test cases, use the following command:
 
 # modificasdta
 
+from array import array
+import bz2
 import datetime
 import flow_processed_output
+import itertools
 import os
 import pickle
 import random
+import tempfile
 from typing import List
 import unittest
+import unittest.mock
 import warnings
 
 
@@ -32,27 +37,37 @@ class testDetectorIdToRoadSections(unittest.TestCase):
     wrong files are tested by checking that Exceptions or Warnings are
     appropriately raised.
     """
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a temporary directory for the files of all test cases."""
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        cls.dir = cls._temp_dir.name
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the temporary directory and the files in it."""
+        cls._temp_dir.cleanup()
+
     def test_DITRS_export_create_file(self):
         """Verify whether export_to_file() creates a new file."""
-        filepath = '1.txt'
+        filepath = os.path.join(self.dir, '1.txt')
         ditrs = flow_processed_output.DetectorIdToRoadSections()
         ditrs.aimsun_detector_locations = create_DITRS_Dataset(1).dataset
         ditrs.export_to_file(filepath)
         # Check if file was created at filepath
         self.assertTrue(os.path.exists(filepath))
-        os.remove(filepath)
 
     def test_DITRS_import_equals_export(self):
         """Verify that export_to_file() and _import_to_file() will
         return the same values."""
-        filepath = '2.txt'
+        filepath = os.path.join(self.dir, '2.txt')
         original_ditrs = flow_processed_output.DetectorIdToRoadSections()
         original_ditrs.aimsun_detector_locations = (
                                             create_DITRS_Dataset(10).dataset)
         original_ditrs.export_to_file(filepath)
         # Import using constructor
         new_ditrs = flow_processed_output.DetectorIdToRoadSections(filepath)
-        os.remove(filepath)
         # Check if new_ditrs contains the same attributes as the original_ditrs
         self.assertTrue(new_ditrs == original_ditrs)
         # Check if new_ditrs is not equal to a different ditrs of same size
@@ -61,10 +76,40 @@ class testDetectorIdToRoadSections(unittest.TestCase):
                                             create_DITRS_Dataset(10).dataset)
         self.assertFalse(new_ditrs == different_ditrs)
 
+    def test_DITRS_equals_after_item_replaced(self):
+        """Verify that __eq__ reflects an item of aimsun_detector_locations
+        replaced in place after a previous comparison."""
+        ditrs = flow_processed_output.DetectorIdToRoadSections()
+        ditrs.aimsun_detector_locations = create_DITRS_Dataset(10).dataset
+        other_ditrs = flow_processed_output.DetectorIdToRoadSections()
+        other_ditrs.aimsun_detector_locations = list(
+                                            ditrs.aimsun_detector_locations)
+        self.assertTrue(ditrs == other_ditrs)
+        self.assertTrue(ditrs == other_ditrs)
+        # Check if the replaced item is compared
+        other_ditrs.aimsun_detector_locations[0] = (
+            flow_processed_output.DetectorIdToRoadSection(10000, 10000))
+        self.assertFalse(ditrs == other_ditrs)
+        self.assertFalse(other_ditrs == ditrs)
+
+    def test_DITRS_equals_large_ids(self):
+        """Verify that __eq__ compares IDs outside of the int32 range."""
+        for large_id in (2**31, 2**63):
+            ditrs = flow_processed_output.DetectorIdToRoadSections()
+            ditrs.aimsun_detector_locations = [
+                flow_processed_output.DetectorIdToRoadSection(large_id, 1)]
+            other_ditrs = flow_processed_output.DetectorIdToRoadSections()
+            other_ditrs.aimsun_detector_locations = [
+                flow_processed_output.DetectorIdToRoadSection(large_id, 1)]
+            self.assertTrue(ditrs == other_ditrs)
+            other_ditrs.aimsun_detector_locations = [
+                flow_processed_output.DetectorIdToRoadSection(large_id + 1, 1)]
+            self.assertFalse(ditrs == other_ditrs)
+
     def test_DITRS_export_existing_file(self):
         """Verify that export_to_file() raises a warning if a file
         already exists at given filepath."""
-        filepath = '3.txt'
+        filepath = os.path.join(self.dir, '3.txt')
         existing_file = open(filepath, 'x')
         existing_file.write("This file is existing.")
         existing_file.close()
@@ -74,12 +119,11 @@ class testDetectorIdToRoadSections(unittest.TestCase):
         with warnings.catch_warnings(record=True) as w:
             ditrs.export_to_file(filepath)
             self.assertTrue(len(w) == 1)
-        os.remove(filepath)
 
     def test_DITRS_export_empty_dataset(self):
         """Verify that export_to_file() throws an exception when
         DetectorIdToRoadSections object has empty flow_data_set."""
-        filepath = '4.txt'
+        filepath = os.path.join(self.dir, '4.txt')
         empty_ditrs = flow_processed_output.DetectorIdToRoadSections()
         empty_ditrs.aimsun_detector_locations = create_DITRS_Dataset(0).dataset
         # Check if exception was raised for empty aimsun_detector_locations
@@ -89,28 +133,95 @@ class testDetectorIdToRoadSections(unittest.TestCase):
     def test_DITRS_import_wrong_file_serialized(self):
         """Verify that _import_from_file() throws an exception when
         given file contains wrong data type."""
-        filepath = '5.txt'
+        filepath = os.path.join(self.dir, '5.txt')
         with open(filepath, 'wb') as file:
             pickle.dump(["This is a wrong dataset"], file)
         # Check if exception was raised for wrong data type
         with self.assertRaises(Exception):
             flow_processed_output.DetectorIdToRoadSections(filepath)
-        os.remove(filepath)
+
+    def test_DITRS_import_wrong_file_mixed_list(self):
+        """Verify that _import_from_file() throws an exception when
+        given file contains a list whose last item has a wrong data type."""
+        filepath = os.path.join(self.dir, '6.txt')
+        with open(filepath, 'wb') as file:
+            pickle.dump(create_DITRS_Dataset(5).dataset
+                        + ["This is a wrong dataset"], file)
+        # Check if exception was raised for wrong data type
+        with self.assertRaises(Exception):
+            flow_processed_output.DetectorIdToRoadSections(filepath)
 
     def test_DITRS_import_wrong_file_unserialized(self):
         """Verify that _import_from_file() throws an exception when given
         file did not follow serialization protocols at export_to_file()."""
-        filepath = '6.txt'
+        filepath = os.path.join(self.dir, '7.txt')
         wrong_file = open(filepath, 'x')
         wrong_file.write("This is not a serialized detector flow data")
         wrong_file.close()
         # Check if exception was raised for wrong serialization
         with self.assertRaises(Exception):
             flow_processed_output.DetectorIdToRoadSections(filepath)
-        os.remove(filepath)
+
+    def test_DITRS_import_equals_export_compressed(self):
+        """Verify that a compressed export_to_file() is imported back by
+        _import_from_file() with the same values."""
+        filepath = os.path.join(self.dir, '8.txt')
+        original_ditrs = flow_processed_output.DetectorIdToRoadSections()
+        original_ditrs.aimsun_detector_locations = (
+                                            create_DITRS_Dataset(10).dataset)
+        original_ditrs.export_to_file(filepath, compress=True)
+        new_ditrs = flow_processed_output.DetectorIdToRoadSections(filepath)
+        # Check if new_ditrs contains the same attributes as the original_ditrs
+        self.assertTrue(new_ditrs == original_ditrs)
+
+    def test_DITRS_import_plain_pickle(self):
+        """Verify that _import_from_file() still imports files holding a
+        plain pickle of aimsun_detector_locations."""
+        filepath = os.path.join(self.dir, '9.txt')
+        original_ditrs = flow_processed_output.DetectorIdToRoadSections()
+        original_ditrs.aimsun_detector_locations = (
+                                            create_DITRS_Dataset(10).dataset)
+        with open(filepath, 'wb') as file:
+            pickle.dump(original_ditrs.aimsun_detector_locations, file)
+        new_ditrs = flow_processed_output.DetectorIdToRoadSections(filepath)
+        # Check if new_ditrs contains the same attributes as the original_ditrs
+        self.assertTrue(new_ditrs == original_ditrs)
+
+    def test_DITRS_export_after_item_replaced(self):
+        """Verify that export_to_file() writes an item replaced in place
+        after a previous export."""
+        filepath = os.path.join(self.dir, '10.txt')
+        ditrs = flow_processed_output.DetectorIdToRoadSections()
+        ditrs.aimsun_detector_locations = [
+            flow_processed_output.DetectorIdToRoadSection(1, 2)]
+        ditrs.export_to_file(filepath)
+        ditrs.aimsun_detector_locations[0] = (
+            flow_processed_output.DetectorIdToRoadSection(3, 4))
+        with warnings.catch_warnings(record=True):
+            ditrs.export_to_file(filepath)
+        new_ditrs = flow_processed_output.DetectorIdToRoadSections(filepath)
+        # Check if the second export holds the replaced item
+        self.assertEqual(new_ditrs.aimsun_detector_locations,
+                         [flow_processed_output.DetectorIdToRoadSection(3, 4)])
+
+    def test_DITRS_import_legacy_pickle(self):
+        """Verify that _import_from_file() imports files exported before
+        DetectorIdToRoadSection was a data class."""
+        filepath = os.path.join(self.dir, '11.txt')
+        original_ditrs = flow_processed_output.DetectorIdToRoadSections()
+        original_ditrs.aimsun_detector_locations = (
+                                            create_DITRS_Dataset(10).dataset)
+        dump_legacy_pickle(filepath, 'DetectorIdToRoadSection',
+                           [{'detector_id': location.detector_id,
+                             'section_id': location.section_id}
+                            for location
+                            in original_ditrs.aimsun_detector_locations])
+        new_ditrs = flow_processed_output.DetectorIdToRoadSections(filepath)
+        # Check if new_ditrs contains the same attributes as the original_ditrs
+        self.assertEqual(new_ditrs.aimsun_detector_locations,
+                         original_ditrs.aimsun_detector_locations)
 
 
-# TODO(Theo/John): modify test cases if the year attribute is used
 class testOutputFlowDataSet(unittest.TestCase):
     """Test the export_to_file() and _import_from_file() methods
     of the OutputFlowDataSet() class in flow_processed_output.py.
@@ -122,26 +233,35 @@ class testOutputFlowDataSet(unittest.TestCase):
     appropriately raised.
     """
 
+    @classmethod
+    def setUpClass(cls):
+        """Create a temporary directory for the files of all test cases."""
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        cls.dir = cls._temp_dir.name
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the temporary directory and the files in it."""
+        cls._temp_dir.cleanup()
+
     def test_OFDS_export_create_file(self):
         """Verify whether export_to_file() creates a new file."""
-        filepath = '1.txt'
+        filepath = os.path.join(self.dir, '1.txt')
         ofds = flow_processed_output.OutputFlowDataSet()
         ofds.flow_data_set = create_OFDS_Dataset(1).dataset
         ofds.export_to_file(filepath)
         # Check if file was created at filepath
         self.assertTrue(os.path.exists(filepath))
-        os.remove(filepath)
 
     def test_OFDS_import_equals_export(self):
         """Verify that export_to_file() and _import_to_file() will
         return the same values."""
-        filepath = '2.txt'
+        filepath = os.path.join(self.dir, '2.txt')
         original_ofds = flow_processed_output.OutputFlowDataSet()
         original_ofds.flow_data_set = create_OFDS_Dataset(10).dataset
         original_ofds.export_to_file(filepath)
         # Import using constructor
         new_ofds = flow_processed_output.OutputFlowDataSet(filepath)
-        os.remove(filepath)
         # Check if new_ofds contains the same attributes as the original_ofds
         self.assertTrue(new_ofds == original_ofds)
         # Check if new_ofds is not equal to a different ofds of same size
@@ -149,10 +269,44 @@ class testOutputFlowDataSet(unittest.TestCase):
         different_ofds.flow_data_set = create_OFDS_Dataset(10).dataset
         self.assertFalse(new_ofds == different_ofds)
 
+    def test_OFDS_import_equals_export_typecodes(self):
+        """Verify that export_to_file() and pickle keep the typecodes of
+        times and flows other than int64 and float32."""
+        filepath = os.path.join(self.dir, '13.txt')
+        original_ofds = flow_processed_output.OutputFlowDataSet()
+        original_ofds.flow_data_set = [flow_processed_output.OutputFlowData(
+            detector_id=1, flows=array('d', [1.5, 123.456]), section_id=2,
+            times=array('i', [10, 20]))]
+        original_ofds.export_to_file(filepath)
+        new_ofds = flow_processed_output.OutputFlowDataSet(filepath)
+        pickled_ofds = pickle.loads(pickle.dumps(original_ofds, protocol=5))
+        for ofds in (new_ofds, pickled_ofds):
+            flow_data = ofds.flow_data_set[0]
+            self.assertEqual(flow_data.times.typecode, 'i')
+            self.assertEqual(flow_data.times.tolist(), [10, 20])
+            self.assertEqual(flow_data.flows.typecode, 'd')
+            self.assertEqual(flow_data.flows.tolist(), [1.5, 123.456])
+
+    def test_OFDS_equals_after_item_replaced(self):
+        """Verify that __eq__ reflects an item of flow_data_set replaced in
+        place after a previous comparison."""
+        ofds = flow_processed_output.OutputFlowDataSet()
+        ofds.flow_data_set = create_OFDS_Dataset(10).dataset
+        other_ofds = flow_processed_output.OutputFlowDataSet()
+        other_ofds.flow_data_set = list(ofds.flow_data_set)
+        self.assertTrue(ofds == other_ofds)
+        self.assertTrue(ofds == other_ofds)
+        # Check if the replaced item is compared
+        other_ofds.flow_data_set[0] = flow_processed_output.OutputFlowData(
+            detector_id=10000, flows=array('f'), section_id=10000,
+            times=array('q'))
+        self.assertFalse(ofds == other_ofds)
+        self.assertFalse(other_ofds == ofds)
+
     def test_OFDS_export_existing_file(self):
         """Verify that export_to_file() raises a warning if a file
         already exists at given filepath."""
-        filepath = '3.txt'
+        filepath = os.path.join(self.dir, '3.txt')
         existing_file = open(filepath, 'x')
         existing_file.write("This file is existing.")
         existing_file.close()
@@ -162,12 +316,27 @@ class testOutputFlowDataSet(unittest.TestCase):
         with warnings.catch_warnings(record=True) as w:
             ofds.export_to_file(filepath)
             self.assertTrue(len(w) == 1)
-        os.remove(filepath)
+
+    def test_OFDS_export_overwrites_file(self):
+        """Verify that export_to_file() replaces an existing file without
+        leaving a temporary file behind."""
+        filepath = os.path.join(self.dir, '11.txt')
+        with open(filepath, 'x') as existing_file:
+            existing_file.write("This file is existing.")
+        files = sorted(os.listdir(self.dir))
+        original_ofds = flow_processed_output.OutputFlowDataSet()
+        original_ofds.flow_data_set = create_OFDS_Dataset(5).dataset
+        with warnings.catch_warnings(record=True):
+            original_ofds.export_to_file(filepath)
+        new_ofds = flow_processed_output.OutputFlowDataSet(filepath)
+        # Check if the existing file was replaced by the exported data
+        self.assertTrue(new_ofds == original_ofds)
+        self.assertEqual(sorted(os.listdir(self.dir)), files)
 
     def test_OFDS_export_empty_dataset(self):
         """Verify that export_to_file() throws an exception when
         OutputFlowDataSet object has empty flow_data_set."""
-        filepath = '4.txt'
+        filepath = os.path.join(self.dir, '4.txt')
         empty_ofds = flow_processed_output.OutputFlowDataSet()
         empty_ofds.flow_data_set = create_OFDS_Dataset(0).dataset
         # Check if exception was raised for empty flow_data_set
@@ -177,25 +346,129 @@ class testOutputFlowDataSet(unittest.TestCase):
     def test_OFDS_import_wrong_file_serialized(self):
         """Verify that _import_from_file() throws an exception when
         given file contains wrong data type."""
-        filepath = '5.txt'
+        filepath = os.path.join(self.dir, '5.txt')
         with open(filepath, 'wb') as file:
             pickle.dump(["This is a wrong dataset"], file)
         # Check if exception was raised for wrong data type
         with self.assertRaises(Exception):
             flow_processed_output.OutputFlowDataSet(filepath)
-        os.remove(filepath)
 
     def test_OFDS_import_wrong_file_unserialized(self):
         """Verify that _import_from_file() throws an exception when given
         file did not follow serialization protocols at export_to_file()."""
-        filepath = '6.txt'
+        filepath = os.path.join(self.dir, '6.txt')
         wrong_file = open(filepath, 'x')
         wrong_file.write("This is not a serialized detector flow data")
         wrong_file.close()
         # Check if exception was raised for wrong serialization
         with self.assertRaises(Exception):
             flow_processed_output.OutputFlowDataSet(filepath)
-        os.remove(filepath)
+
+    def test_OFDS_import_truncated_file(self):
+        """Verify that _import_from_file() throws an exception when the
+        exported file was truncated."""
+        filepath = os.path.join(self.dir, '7.txt')
+        ofds = flow_processed_output.OutputFlowDataSet()
+        ofds.flow_data_set = create_OFDS_Dataset(10).dataset
+        ofds.export_to_file(filepath)
+        with open(filepath, 'r+b') as file:
+            file.truncate(os.path.getsize(filepath) - 1)
+        # Check if exception was raised for the missing data
+        with self.assertRaises(Exception):
+            flow_processed_output.OutputFlowDataSet(filepath)
+
+    def test_OFDS_import_plain_pickle(self):
+        """Verify that _import_from_file() still imports files holding a
+        plain pickle of flow_data_set."""
+        filepath = os.path.join(self.dir, '8.txt')
+        original_ofds = flow_processed_output.OutputFlowDataSet()
+        original_ofds.flow_data_set = create_OFDS_Dataset(10).dataset
+        with open(filepath, 'wb') as file:
+            pickle.dump(original_ofds.flow_data_set, file, protocol=4)
+        new_ofds = flow_processed_output.OutputFlowDataSet(filepath)
+        # Check if new_ofds contains the same attributes as the original_ofds
+        self.assertTrue(new_ofds == original_ofds)
+
+    def test_OFDS_import_legacy_pickle(self):
+        """Verify that _import_from_file() imports files exported before
+        OutputFlowData stored its flow data as times and flows."""
+        filepath = os.path.join(self.dir, '10.txt')
+        flow_data = {datetime.time(0, 0, 5): 1.5,
+                     datetime.time(8, 30, 0): 12.25,
+                     datetime.time(23, 59, 59): 0.0}
+        dump_legacy_pickle(filepath, 'OutputFlowData',
+                           [{'detector_id': 1, 'flow_data': flow_data,
+                             'section_id': 2}])
+        new_ofds = flow_processed_output.OutputFlowDataSet(filepath)
+        # Check if flow_data was converted to times and flows
+        self.assertEqual(new_ofds.flow_data_set, [
+            flow_processed_output.OutputFlowData(
+                detector_id=1, flows=array('f', [1.5, 12.25, 0.0]),
+                section_id=2, times=array('q', [5, 30600, 86399]))])
+
+    def test_OFDS_import_legacy_pickle_precision(self):
+        """Verify that _import_from_file() warns the user when flow data of
+        files exported before OutputFlowData stored times and flows loses
+        fractions of a second or flow size precision."""
+        filepath = os.path.join(self.dir, '14.txt')
+        dump_legacy_pickle(filepath, 'OutputFlowData',
+                           [{'detector_id': 1,
+                             'flow_data': {datetime.time(8, 0, 0, 500): 1.5},
+                             'section_id': 2}])
+        with self.assertWarnsRegex(Warning, 'fractions of a second'):
+            flow_processed_output.OutputFlowDataSet(filepath)
+        dump_legacy_pickle(filepath, 'OutputFlowData',
+                           [{'detector_id': 1,
+                             'flow_data': {datetime.time(8, 0, 0): 123.456},
+                             'section_id': 2}])
+        with self.assertWarnsRegex(Warning, 'single precision'):
+            new_ofds = flow_processed_output.OutputFlowDataSet(filepath)
+        # Check if the flow size was rounded to single precision
+        self.assertEqual(new_ofds.flow_data_set[0].flows,
+                         array('f', [123.456]))
+
+    def test_OFDS_import_equals_export_compressed(self):
+        """Verify that a compressed export_to_file() is imported back by
+        _import_from_file() with the same values."""
+        filepath = os.path.join(self.dir, '9.txt')
+        original_ofds = flow_processed_output.OutputFlowDataSet()
+        original_ofds.flow_data_set = create_OFDS_Dataset(10).dataset
+        original_ofds.export_to_file(filepath, compress=True)
+        new_ofds = flow_processed_output.OutputFlowDataSet(filepath)
+        # Check if new_ofds contains the same attributes as the original_ofds
+        self.assertTrue(new_ofds == original_ofds)
+
+    def test_OFDS_import_bz2_compressed(self):
+        """Verify that _import_from_file() imports files compressed with
+        bz2, as written by earlier versions of export_to_file()."""
+        filepath = os.path.join(self.dir, '12.txt')
+        original_ofds = flow_processed_output.OutputFlowDataSet()
+        original_ofds.flow_data_set = create_OFDS_Dataset(10).dataset
+        original_ofds.export_to_file(filepath)
+        with open(filepath, 'rb') as file:
+            data = file.read()
+        with open(filepath, 'wb') as file:
+            file.write(bz2.compress(data))
+        new_ofds = flow_processed_output.OutputFlowDataSet(filepath)
+        # Check if new_ofds contains the same attributes as the original_ofds
+        self.assertTrue(new_ofds == original_ofds)
+
+
+def dump_legacy_pickle(filepath: str, class_name: str, states: List[dict]):
+    """Pickles a list of objects of flow_processed_output.class_name as the
+    earlier, __dict__-based class did, with states as their attributes."""
+    legacy_class = type(class_name, (),
+                        {'__module__': flow_processed_output.__name__})
+    objects = []
+    for state in states:
+        legacy_object = legacy_class()
+        legacy_object.__dict__.update(state)
+        objects.append(legacy_object)
+    # Pickle looks classes up by name, so substitute the earlier class
+    with unittest.mock.patch.object(flow_processed_output, class_name,
+                                    legacy_class):
+        with open(filepath, 'wb') as file:
+            pickle.dump(objects, file)
 
 
 class create_DITRS_Dataset:
@@ -224,25 +497,22 @@ class create_DITRS_Dataset:
 
     def generate_dataset(self):
         """Add DetectorIdToRoadSection to dataset"""
-        for _ in range(self.datasize):
-            detector_section_ids = (
-                flow_processed_output.DetectorIdToRoadSection())
-            # Generate random detector_id
-            random_detector_id = flow_processed_output.DetectorId(
-                                 random.randint(0, 9999))
-            assert isinstance(random_detector_id,
-                              flow_processed_output.DetectorId(int))
-            # Generate random section_id
-            random_section_id = flow_processed_output.SectionId(
-                                random.randint(0, 9999))
-            assert isinstance(random_section_id,
-                              flow_processed_output.SectionId(int))
-            # Add random detector_id and section_id to detector_section_ids
-            detector_section_ids.detector_id = random_detector_id
-            detector_section_ids.section_id = random_section_id
-            self.dataset += [detector_section_ids]
+        # Draw the random IDs of all detectors at once
+        random_detector_ids = random.choices(range(10000), k=self.datasize)
+        random_section_ids = random.choices(range(10000), k=self.datasize)
+        self.dataset = [self.generate_detector_section_ids(detector_id,
+                                                           section_id)
+                        for detector_id, section_id
+                        in zip(random_detector_ids, random_section_ids)]
         assert len(self.dataset) == self.datasize
 
+    def generate_detector_section_ids(self, detector_id: int,
+                                      section_id: int):
+        """Generate detector and section IDs for a detector"""
+        return flow_processed_output.DetectorIdToRoadSection(
+            detector_id=flow_processed_output.DetectorId(detector_id),
+            section_id=flow_processed_output.SectionId(section_id))
+
 
 class create_OFDS_Dataset:
     """Generator class for OutputFlowDataSet's flow_data_set.
@@ -269,61 +539,40 @@ class create_OFDS_Dataset:
 
     def generate_dataset(self):
         """Add OutputFlowData to dataset"""
-        for _ in range(self.datasize):
-            output_flow_data = self.generate_output_flow_data()
-            self.dataset += [output_flow_data]
+        # Draw the random values of all detectors at once
+        random_detector_ids = random.choices(range(10000), k=self.datasize)
+        random_section_ids = random.choices(range(10000), k=self.datasize)
+        random_sizes = random.choices(range(101), k=self.datasize)
+        random_times = self.generate_times(sum(random_sizes))
+        random_flows = self.generate_flowsizes(sum(random_sizes))
+        # Split times and flows into consecutive slices, one per detector
+        ends = list(itertools.accumulate(random_sizes))
+        starts = [0] + ends[:-1]
+        self.dataset = [self.generate_output_flow_data(
+                            detector_id, section_id,
+                            random_times[start:end], random_flows[start:end])
+                        for detector_id, section_id, start, end
+                        in zip(random_detector_ids, random_section_ids,
+                               starts, ends)]
         assert len(self.dataset) == self.datasize
 
-    def generate_output_flow_data(self):
+    def generate_output_flow_data(self, detector_id: int, section_id: int,
+                                  times: array, flows: array):
         """Generate flow data for a detector"""
-        # Generate random detector_id
-        random_detector_id = flow_processed_output.DetectorId(
-                             random.randint(0, 9999))
-        assert isinstance(random_detector_id,
-                          flow_processed_output.DetectorId(int))
-        # Generate random section_id
-        random_section_id = flow_processed_output.SectionId(
-                            random.randint(0, 9999))
-        assert isinstance(random_section_id,
-                          flow_processed_output.SectionId(int))
-        # Generate random flow_data
-        random_flow_data = self.generate_flowdata()
-        # Create OutputFlowData with above parameters
-        random_output_flow_data = flow_processed_output.OutputFlowData()
-        random_output_flow_data.detector_id = random_detector_id
-        random_output_flow_data.section_id = random_section_id
-        random_output_flow_data.flow_data = random_flow_data
-        assert isinstance(random_output_flow_data,
-                          flow_processed_output.OutputFlowData)
-        return random_output_flow_data
-
-    def generate_flowdata(self):
-        """Generate a random flow data for a detector."""
-        random_flowdata = {}
-        datasize = random.randint(0, 100)
-        for _ in range(datasize):
-            timestamp = self.generate_datetime()
-            flowsize = self.generate_flowsize()
-            random_flowdata.update({timestamp: flowsize})
-        assert isinstance(random_flowdata, dict)
-        return random_flowdata
-
-    def generate_datetime(self):
-        """Generate a random datetime for a detector's flow data."""
-        min_year = 1980
-        max_year = 2021
-        start = datetime.datetime(min_year, 1, 1, 00, 00, 00)
-        years = max_year - min_year + 1
-        end = start + datetime.timedelta(days=365 * years)
-        random_datetime = start + (end - start) * random.random()
-        assert isinstance(random_datetime, datetime.datetime)
-        return random_datetime
-
-    def generate_flowsize(self):
-        """Generate a random flow size for a detector."""
-        random_flowsize = round(random.uniform(0.0, 200.0), 3)
-        assert isinstance(random_flowsize, float)
-        return random_flowsize
+        return flow_processed_output.OutputFlowData(
+            detector_id=flow_processed_output.DetectorId(detector_id),
+            flows=flows,
+            section_id=flow_processed_output.SectionId(section_id),
+            times=times)
+
+    def generate_times(self, datasize: int):
+        """Generate random times of day in seconds since midnight."""
+        return array('q', random.choices(range(86400), k=datasize))
+
+    def generate_flowsizes(self, datasize: int):
+        """Generate random flow sizes between 0 and 200 with 3 decimals."""
+        return array('f', [flowsize / 1000 for flowsize
+                           in random.choices(range(200001), k=datasize)])
 
 
 if __name__ == '__main__':
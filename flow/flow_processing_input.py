@@ -13,19 +13,43 @@ Classes:
 
 
 import datetime
+import io
 import pickle
-import warnings
 
-from enum import Enum
-from os import path
-from shapely.geometry import Point
-from typing import Dict, NewType, Tuple, List
+from array import array
+from dataclasses import dataclass
+from enum import IntEnum
+from operator import itemgetter
+from typing import Dict, NewType, Optional, Tuple, List
+
+from flow_file_io import is_list_of, read_from_file, write_to_file
 
 DetectorId = NewType('DetectorId', int)
 SectionId = NewType('SectionId', int)
 
+# Headers written at the start of exported files: a four-letter tag and a
+# format version. Files without a header are validated after unpickling.
+_DLOC_MAGIC = b'DLOC\x00\x00\x00\x01'
+_GFDA_MAGIC = b'GFDA\x00\x00\x00\x01'
+
+# Origin and unit of DetectorFlowData timestamps
+_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
 
-class Direction(Enum):
+def _is_location_arrays(data) -> bool:
+    """Returns whether data is a (ids, directions, coordinates, year) tuple
+    as exported by DetectorsLocation."""
+    return (isinstance(data, tuple) and len(data) == 4
+            and isinstance(data[0], array)
+            and data[0].typecode in ('i', 'q')
+            and isinstance(data[1], array) and data[1].typecode == 'B'
+            and isinstance(data[2], array) and data[2].typecode == 'd'
+            and len(data[0]) == len(data[1]) == len(data[2]) // 2
+            and len(data[2]) % 2 == 0 and isinstance(data[3], int))
+
+
+class Direction(IntEnum):
     """Possible direction of the flow going through a detector."""
     north_bound = 1
     east_bound = 2
@@ -33,6 +57,27 @@ class Direction(Enum):
     west_bound = 4
 
 
+def _coordinates_as_tuples(locations: Dict) -> Dict[
+        DetectorId, Tuple[Direction, Tuple[float, float]]]:
+    """Returns locations with every location's coordinates as (x, y).
+
+    Older files hold the coordinates as shapely Points, which are converted
+    through their x and y attributes. Raises exception if coordinates are
+    neither a Point nor an (x, y) tuple.
+    """
+    converted = {}
+    for detector_id, (direction, coordinates) in locations.items():
+        if isinstance(coordinates, tuple) and len(coordinates) == 2:
+            converted[detector_id] = (direction, coordinates)
+        elif hasattr(coordinates, 'x') and hasattr(coordinates, 'y'):
+            converted[detector_id] = (direction,
+                                      (float(coordinates.x),
+                                       float(coordinates.y)))
+        else:
+            raise Exception("File has incorrect data type. Import aborted.")
+    return converted
+
+
 class DetectorsLocation:
     """Detectors location data class.
 
@@ -47,94 +92,226 @@ class DetectorsLocation:
         >>> dl = DetectorsLocation(year, filepath)
 
     Attributes:
-        detectors_location_dict: Dictionary of the detector locations.
+        detectors_location_dict: Dictionary of the detector locations. Each
+            location is the direction and the (x, y) coordinates of the
+            detector.
         year: Year data was collected.
     """
-    detectors_location_dict: Dict[DetectorId, Tuple[Direction, Point]]
+    _location_arrays: Optional[Tuple[array, array, array]]
+    _location_dict: Optional[Dict[DetectorId,
+                                  Tuple[Direction, Tuple[float, float]]]]
     year: int
 
     def __init__(self, year: int, filepath: str = ""):
+        self._location_arrays = None
+        self._location_dict = {}
         self.year = year
         if filepath != "":
             self._import_from_file(filepath)
 
-    def export_to_file(self, filepath: str):
-        """Export DetectorsLocation to file by serializing
-        `detectors_location_dict` and `year`.
+    @property
+    def detectors_location_dict(self) -> Dict[
+            DetectorId, Tuple[Direction, Tuple[float, float]]]:
+        """Dictionary of the detector locations, rebuilt from the arrays
+        after an import."""
+        if self._location_dict is None:
+            ids, directions, coordinates = self._location_arrays
+            self._location_dict = dict(zip(
+                ids, zip(map(Direction, directions),
+                         zip(coordinates[0::2], coordinates[1::2]))))
+        # The dictionary is the source of the locations from now on, as the
+        # caller may modify it in place
+        self._location_arrays = None
+        return self._location_dict
+
+    @detectors_location_dict.setter
+    def detectors_location_dict(self, value: Dict[
+            DetectorId, Tuple[Direction, Tuple[float, float]]]):
+        self._location_arrays = None
+        self._location_dict = value
+
+    def as_arrays(self) -> Tuple[array, array, array]:
+        """Returns the detector locations as parallel arrays.
+
+        The arrays are the detector IDs ('q'), the direction values ('B')
+        and the flattened (x, y) coordinates ('d'), sorted by detector ID so
+        that equal dictionaries give equal arrays. They are built from
+        detectors_location_dict on every call, unless the locations were
+        imported and the dictionary has not been requested since. The
+        arrays must be treated as read-only.
+        """
+        if self._location_dict is None:
+            return self._location_arrays
+        locations = sorted(self._location_dict.items(), key=itemgetter(0))
+        coordinates = array('d')
+        for _, (_, (x, y)) in locations:
+            coordinates.append(x)
+            coordinates.append(y)
+        return (array('q', [detector_id for detector_id, _ in locations]),
+                array('B', [direction for _, (direction, _) in locations]),
+                coordinates)
+
+    def _num_locations(self) -> int:
+        """Returns the number of detectors without building the arrays."""
+        if self._location_dict is None:
+            return len(self._location_arrays[0])
+        return len(self._location_dict)
+
+    def export_to_file(self, filepath: str, compress: bool = False):
+        """Export DetectorsLocation to file by serializing the location
+        arrays and `year`.
 
         Raises exception if the detectors_location_dict is empty. Warns the
         user if a file already exists at filepath and overwrites it.
+
+        Args:
+            filepath: Location to export object attributes.
+            compress: Whether to gzip-compress the exported file.
         """
+        ids, directions, coordinates = self.as_arrays()
         # Check if detectors_location_dict is empty
-        if len(self.detectors_location_dict) == 0:
+        if len(ids) == 0:
             raise Exception('DetectorsLocation has no data. Export aborted.')
-        # Check if file exists at given filepath
-        if path.exists(filepath):
-            warnings.warn('File already exists at filepath. Overwriting file.')
-        # Serialize detectors_location_dict and write to filepath
-        with open(filepath, 'wb') as file:
-            pickle.dump(self.detectors_location_dict, file)
-            pickle.dump(self.year, file)
+        # Serialize location arrays and year and write to filepath
+        data = pickle.dumps((ids, directions, coordinates, self.year),
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        write_to_file(filepath, _DLOC_MAGIC, data, compress)
 
     def _import_from_file(self, filepath: str):
-        """Import DetectorsLocation from file by deserializing
-        `detectors_location_dict` and `year`.
-
-        Raises exception if the given file does not match the data type of
-        detector_flow_data (Dict) and year (int).
+        """Import DetectorsLocation from file by deserializing the location
+        arrays and `year`.
+
+        Files starting with the export header are trusted. Files without it,
+        including those holding `detectors_location_dict` as a dictionary,
+        are checked after loading. Raises exception if such a file does not
+        match the data type of the location arrays (array) or
+        detectors_location_dict (Dict) and year (int), or if it holds shapely
+        Points and shapely is not installed.
         """
-        # Deserialize detectors_location_dict from filepath
-        with open(filepath, 'rb') as file:
-            imported_location_dict = pickle.load(file)
-            imported_year = pickle.load(file)
-        # Check if imported data matches data type of detectors_location_dict
-        if (isinstance(imported_location_dict, dict) and
-                isinstance(imported_year, int)):
-            self.detectors_location_dict = imported_location_dict
-            self.year = imported_year
+        # Deserialize location arrays and year from filepath
+        data = read_from_file(filepath)
+        if data[:len(_DLOC_MAGIC)] == _DLOC_MAGIC:
+            # Written by export_to_file, so the data types are known
+            with memoryview(data) as view:
+                *arrays, self.year = pickle.loads(view[len(_DLOC_MAGIC):])
+            self._location_arrays = tuple(arrays)
+            self._location_dict = None
+            return
+        try:
+            imported_data = pickle.loads(data)
+            if isinstance(imported_data, dict):
+                # Older files hold two pickles, the dictionary and the year
+                stream = io.BytesIO(data)
+                imported_data = (pickle.load(stream), pickle.load(stream))
+        except ImportError as error:
+            # Older files hold the coordinates as shapely Points
+            if not (error.name or '').startswith('shapely'):
+                raise
+            raise Exception('File holds shapely Points, reading it requires '
+                            'shapely. Import aborted.') from error
+        # Check if imported data matches data type of the location arrays
+        if _is_location_arrays(imported_data):
+            self._location_arrays = imported_data[:3]
+            self._location_dict = None
+            self.year = imported_data[3]
+        elif (isinstance(imported_data, tuple) and len(imported_data) == 2
+                and isinstance(imported_data[0], dict)
+                and isinstance(imported_data[1], int)):
+            self.detectors_location_dict = _coordinates_as_tuples(
+                imported_data[0])
+            self.year = imported_data[1]
         else:
             raise Exception("File has incorrect data type. Import aborted.")
 
     def __eq__(self, other):
         """Evaluates object equality based on attributes."""
+        if self is other:
+            return True
         # Return False if year is different
         if self.year != other.year:
             return False
-        for key in self.detectors_location_dict:
-            if key in other.detectors_location_dict:
-                selfVal = self.detectors_location_dict[key]
-                selfDirection = selfVal[0]
-                selfPoint = selfVal[1]
-                otherVal = other.detectors_location_dict[key]
-                otherDirection = otherVal[0]
-                otherPoint = otherVal[1]
-                if not (selfDirection == otherDirection
-                        and selfPoint.x == otherPoint.x
-                        and selfPoint.y == otherPoint.y):
-                    return False
-            else:
-                return False
-        return True
+        # Return False if the number of detectors is different
+        if self._num_locations() != other._num_locations():
+            return False
+        # Compare IDs, directions and coordinates as whole arrays
+        return self.as_arrays() == other.as_arrays()
 
 
+def _as_naive_utc(timestamp: datetime.datetime) -> datetime.datetime:
+    """Returns timestamp converted to naive UTC if it is timezone-aware."""
+    if timestamp.utcoffset() is None:
+        return timestamp
+    return timestamp.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+
+@dataclass(frozen=True)
 class DetectorFlowData:
     """Detector flow data class.
 
     The object corresponds to data from one traffic flow detector.
+    Instances are immutable.
+
+    To create the DetectorFlowData from a dictionary of flows, use the
+    following command:
+        >>> dfd = DetectorFlowData.from_dict(detector_id, direction,
+        ...                                  flow_data, name, year)
 
     Attributes:
         detector_id: ID of the detector.
         direction: Direction of the detected flow.
-        flow_data: Timestamps and sizes of detected flows.
+        flows: Sizes of detected flows, as an array of doubles ('d').
         name: Name of the detector.
+        timestamps: Timestamps of detected flows, as an array of
+            microseconds since 1970-01-01 00:00:00 ('q'). Timezone-aware
+            timestamps are stored in UTC.
         year: Year data was collected.
     """
+    __slots__ = ('detector_id', 'direction', 'flows', 'name', 'timestamps',
+                 'year')
     detector_id: DetectorId
     direction: Direction
-    flow_data: Dict[datetime.datetime, float]
+    flows: array
     name: str
+    timestamps: array
     year: int
 
+    @classmethod
+    def from_dict(cls, detector_id: DetectorId, direction: Direction,
+                  flow_data: Dict[datetime.datetime, float], name: str,
+                  year: int) -> 'DetectorFlowData':
+        """Creates DetectorFlowData from a dictionary of timestamps and
+        sizes of detected flows.
+
+        Timezone-aware timestamps are converted to UTC, so as_dict() returns
+        them as naive UTC timestamps.
+        """
+        timestamps = array('q', [(_as_naive_utc(timestamp) - _EPOCH)
+                                 // _MICROSECOND for timestamp in flow_data])
+        return cls(detector_id, direction, array('d', flow_data.values()),
+                   name, timestamps, year)
+
+    def as_dict(self) -> Dict[datetime.datetime, float]:
+        """Returns the timestamps and sizes of detected flows as a
+        dictionary."""
+        return {_EPOCH + _MICROSECOND * timestamp: flow
+                for timestamp, flow in zip(self.timestamps, self.flows)}
+
+    def __reduce__(self):
+        """Pickles the object as a constructor call on its attributes."""
+        return (DetectorFlowData, (self.detector_id, self.direction,
+                                   self.flows, self.name, self.timestamps,
+                                   self.year))
+
+    def __setstate__(self, state: Dict):
+        """Restores the attributes of objects pickled before
+        DetectorFlowData was a data class."""
+        flow_data = state.pop('flow_data')
+        converted = DetectorFlowData.from_dict(
+            state['detector_id'], state['direction'], flow_data,
+            state['name'], state['year'])
+        for name in self.__slots__:
+            object.__setattr__(self, name, getattr(converted, name))
+
 
 class GroundFlowData:
     """Ground flow data class.
@@ -158,52 +335,49 @@ class GroundFlowData:
         if filepath != "":
             self._import_from_file(filepath)
 
-    def export_to_file(self, filepath: str):
+    def export_to_file(self, filepath: str, compress: bool = False):
         """Export GroundFlowData to file by serializing detector_flow_data.
 
         Raises exception if the detector_flow_data is empty. Warns the user
         if a file already exists at filepath and overwrites it.
+
+        Args:
+            filepath: Location to export object attributes.
+            compress: Whether to gzip-compress the exported file.
         """
         # Check if detector_flow_data is empty
         if len(self.detector_flow_data) == 0:
             raise Exception('GroundFlowData has no data. Export aborted.')
-        # Check if file exists at given filepath
-        if path.exists(filepath):
-            warnings.warn('File already exists at filepath. Overwriting file.')
         # Serialize detector_flow_data and write to filepath
-        with open(filepath, 'wb') as file:
-            pickle.dump(self.detector_flow_data, file)
+        data = pickle.dumps(self.detector_flow_data,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        write_to_file(filepath, _GFDA_MAGIC, data, compress)
 
     def _import_from_file(self, filepath: str):
         """Import GroundFlowData from file by deserializing detector_flow_data.
 
-        Raises exception if the given file does not match the data type of
+        Files starting with the export header are trusted. Raises exception
+        if a file without it does not match the data type of
         detector_flow_data (List[DetectorFlowData]).
         """
         # Deserialize detector_flow_data from filepath
-        with open(filepath, 'rb') as file:
-            imported_data = pickle.load(file)
+        data = read_from_file(filepath)
+        if data[:len(_GFDA_MAGIC)] == _GFDA_MAGIC:
+            # Written by export_to_file, so the data type is known
+            with memoryview(data) as view:
+                self.detector_flow_data = pickle.loads(
+                    view[len(_GFDA_MAGIC):])
+            return
+        imported_data = pickle.loads(data)
         # Check if imported data matches data type of detector_flow_data
-        if (isinstance(imported_data, list)
-                and isinstance(imported_data[0], DetectorFlowData)):
+        if is_list_of(imported_data, DetectorFlowData):
             self.detector_flow_data = imported_data
         else:
             raise Exception("File has incorrect data type. Import aborted.")
 
     def __eq__(self, other):
         """Evaluates object equality based on attributes."""
-        # Return False if detector_flow_data size is different
-        if len(self.detector_flow_data) != len(other.detector_flow_data):
-            return False
-        # Check all attributes of detector_flow_data against each other
-        equality = True
-        for i in range(len(self.detector_flow_data)):
-            this_detector = self.detector_flow_data[i]
-            other_detector = other.detector_flow_data[i]
-            if (this_detector.detector_id != other_detector.detector_id
-                    or this_detector.direction != other_detector.direction
-                    or this_detector.flow_data != other_detector.flow_data
-                    or this_detector.name != other_detector.name
-                    or this_detector.year != other_detector.year):
-                equality = False
-        return equality
+        if self is other:
+            return True
+        # Compare the lengths, then each DetectorFlowData in order
+        return self.detector_flow_data == other.detector_flow_data
@@ -13,14 +13,19 @@ To run all test cases, use the following command:
 # long word asdfjasdkfa sdfa sdhfa sdhf ajsdfa sjdfha djsafh asdjfashd jsafhj sdhfadajsdfhadjasdfasjdfh
 
 import datetime
+import importlib.util
+import itertools
 import os
 import pickle
 import random
 import string
+import sys
+import tempfile
 import unittest
+import unittest.mock
 import warnings
 
-from shapely.geometry import Point
+from array import array
 from typing import List, Dict, Tuple
 
 import flow_processing_input
@@ -37,25 +42,34 @@ class testDetectorsLocation(unittest.TestCase):
     appropriately raised.
     """
 
+    @classmethod
+    def setUpClass(cls):
+        """Create a temporary directory for the files of all test cases."""
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        cls.dir = cls._temp_dir.name
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the temporary directory and the files in it."""
+        cls._temp_dir.cleanup()
+
     def test_DL_export_create_file(self):
         """Verify whether export_to_file() creates a new file."""
-        filepath = '1.txt'
+        filepath = os.path.join(self.dir, '1.txt')
         dl = flow_processing_input.DetectorsLocation(2021)
         dl.detectors_location_dict = createDLDataset(1).dataset
         dl.export_to_file(filepath)
         # Check if file was created at filepath
         self.assertTrue(os.path.exists(filepath))
-        os.remove(filepath)
 
     def test_DL_import_equals_export(self):
         """Verify that export_to_file() and import_to_file() will
         return the same values."""
-        filepath = '2.txt'
+        filepath = os.path.join(self.dir, '2.txt')
         original_dl = flow_processing_input.DetectorsLocation(2021)
         original_dl.detectors_location_dict = createDLDataset(10).dataset
         original_dl.export_to_file(filepath)
         new_dl = flow_processing_input.DetectorsLocation(2021, filepath)
-        os.remove(filepath)
         # Check if new_dl contains the same attributes as the original_dl
         self.assertTrue(new_dl == original_dl)
         # Check if new_dl is not equal to a different DL of same size
@@ -66,7 +80,7 @@ class testDetectorsLocation(unittest.TestCase):
     def test_DL_export_existing_file(self):
         """Verify that export_to_file() raises a warning if a file
         already exists at given filepath."""
-        filepath = '3.txt'
+        filepath = os.path.join(self.dir, '3.txt')
         existing_file = open(filepath, 'x')
         existing_file.write("This file is existing.")
         existing_file.close()
@@ -76,12 +90,32 @@ class testDetectorsLocation(unittest.TestCase):
         with warnings.catch_warnings(record=True) as w:
             dl.export_to_file(filepath)
             self.assertTrue(len(w) == 1)
-        os.remove(filepath)
+
+    def test_DL_export_overwrites_file(self):
+        """Verify that export_to_file() replaces an existing file without
+        leaving a temporary file behind."""
+        filepath = os.path.join(self.dir, '4.txt')
+        with open(filepath, 'x') as existing_file:
+            existing_file.write("This file is existing.")
+        # A file of the user next to filepath must be left untouched
+        with open(filepath + '.tmp', 'x') as user_file:
+            user_file.write("This file is the user's.")
+        files = sorted(os.listdir(self.dir))
+        original_dl = flow_processing_input.DetectorsLocation(2021)
+        original_dl.detectors_location_dict = createDLDataset(5).dataset
+        with warnings.catch_warnings(record=True):
+            original_dl.export_to_file(filepath)
+        new_dl = flow_processing_input.DetectorsLocation(9999, filepath)
+        # Check if the existing file was replaced by the exported data
+        self.assertTrue(new_dl == original_dl)
+        self.assertEqual(sorted(os.listdir(self.dir)), files)
+        with open(filepath + '.tmp') as user_file:
+            self.assertEqual(user_file.read(), "This file is the user's.")
 
     def test_DL_export_empty_dataset(self):
         """Verify that export_to_file() throws an exception when
         GroundFlowData object has empty detector_flow_data."""
-        filepath = '4.txt'
+        filepath = os.path.join(self.dir, '5.txt')
         empty_dl = flow_processing_input.DetectorsLocation(2021)
         empty_dl.detector_flow_data = createDLDataset(0).dataset
         # Check if exception was raised for empty detector_flow_data
@@ -91,38 +125,190 @@ class testDetectorsLocation(unittest.TestCase):
     def test_DL_import_wrong_file_serialized(self):
         """Verify that _import_from_file() throws an exception when
         given file contains wrong data type."""
-        filepath = '5.txt'
+        filepath = os.path.join(self.dir, '6.txt')
         with open(filepath, 'wb') as file:
             pickle.dump(["This is a wrong dataset"], file)
         # Check if exception was raised for wrong data type
         with self.assertRaises(Exception):
             flow_processing_input.DetectorsLocation(9999, filepath)
-        os.remove(filepath)
 
     def test_DL_import_wrong_file_unserialized(self):
         """Verify that _import_from_file() throws an exception when given
         file did not follow serialization protocols at export_to_file()."""
-        filepath = '6.txt'
+        filepath = os.path.join(self.dir, '7.txt')
         wrong_file = open(filepath, 'x')
         wrong_file.write("This is not a serialized detector flow data")
         wrong_file.close()
         # Check if exception was raised for wrong serialization
         with self.assertRaises(Exception):
             flow_processing_input.DetectorsLocation(9999, filepath)
-        os.remove(filepath)
 
     def test_DL_import_from_constructor(self):
         """Verify that adding a filepath to the constructor imports the
         given DetectorsLocation() class properly."""
-        filepath = '7.txt'
+        filepath = os.path.join(self.dir, '8.txt')
         original_dl = flow_processing_input.DetectorsLocation(2021)
         original_dl.detectors_location_dict = createDLDataset(10).dataset
         original_dl.export_to_file(filepath)
         new_dl = flow_processing_input.DetectorsLocation(2021, filepath)
-        os.remove(filepath)
         # Check if new_dl contains the same attributes as the original_dl
         self.assertTrue(new_dl == original_dl)
 
+    def test_DL_import_separate_pickles(self):
+        """Verify that _import_from_file() still imports files holding
+        detectors_location_dict and year as two separate pickles."""
+        filepath = os.path.join(self.dir, '9.txt')
+        original_dl = flow_processing_input.DetectorsLocation(2021)
+        original_dl.detectors_location_dict = createDLDataset(10).dataset
+        with open(filepath, 'wb') as file:
+            pickle.dump(original_dl.detectors_location_dict, file)
+            pickle.dump(original_dl.year, file)
+        new_dl = flow_processing_input.DetectorsLocation(9999, filepath)
+        # Check if new_dl contains the same attributes as the original_dl
+        self.assertTrue(new_dl == original_dl)
+
+    @unittest.skipUnless(importlib.util.find_spec('shapely'),
+                         'shapely is not installed')
+    def test_DL_import_separate_pickles_with_points(self):
+        """Verify that _import_from_file() converts the shapely Points of
+        files holding detectors_location_dict and year as two separate
+        pickles into (x, y) tuples."""
+        from shapely.geometry import Point
+        filepath = os.path.join(self.dir, '14.txt')
+        original_dl = flow_processing_input.DetectorsLocation(2021)
+        original_dl.detectors_location_dict = createDLDataset(10).dataset
+        with open(filepath, 'wb') as file:
+            pickle.dump({detector_id: (direction, Point(x, y))
+                         for detector_id, (direction, (x, y))
+                         in original_dl.detectors_location_dict.items()},
+                        file)
+            pickle.dump(original_dl.year, file)
+        new_dl = flow_processing_input.DetectorsLocation(9999, filepath)
+        # Check if new_dl contains the same attributes as the original_dl
+        self.assertTrue(new_dl == original_dl)
+        self.assertEqual(new_dl.detectors_location_dict,
+                         original_dl.detectors_location_dict)
+        # Check if new_dl can be exported again
+        new_dl.export_to_file(os.path.join(self.dir, '15.txt'))
+
+    def test_DL_import_points_without_shapely(self):
+        """Verify that _import_from_file() raises exception when the file
+        holds shapely Points and shapely cannot be imported."""
+        filepath = os.path.join(self.dir, '17.txt')
+        with open(filepath, 'wb') as file:
+            # Dictionary holding a reference to shapely.geometry.Point
+            file.write(b'}K\x01cshapely.geometry\nPoint\ns.')
+            pickle.dump(2021, file)
+        with unittest.mock.patch.dict(
+                sys.modules, {'shapely': None, 'shapely.geometry': None}):
+            with self.assertRaisesRegex(Exception, 'requires shapely'):
+                flow_processing_input.DetectorsLocation(2021, filepath)
+
+    def test_DL_import_restores_dict(self):
+        """Verify that detectors_location_dict is rebuilt with the same
+        items after importing the location arrays."""
+        filepath = os.path.join(self.dir, '10.txt')
+        original_dl = flow_processing_input.DetectorsLocation(2021)
+        original_dl.detectors_location_dict = createDLDataset(10).dataset
+        original_dl.export_to_file(filepath)
+        new_dl = flow_processing_input.DetectorsLocation(9999, filepath)
+        self.assertEqual(new_dl.as_arrays(), original_dl.as_arrays())
+        self.assertEqual(new_dl.detectors_location_dict,
+                         original_dl.detectors_location_dict)
+
+    def test_DL_import_equals_export_compressed(self):
+        """Verify that a compressed export_to_file() is imported back by
+        _import_from_file() with the same values."""
+        filepath = os.path.join(self.dir, '11.txt')
+        original_dl = flow_processing_input.DetectorsLocation(2021)
+        original_dl.detectors_location_dict = createDLDataset(10).dataset
+        original_dl.export_to_file(filepath, compress=True)
+        new_dl = flow_processing_input.DetectorsLocation(9999, filepath)
+        # Check if new_dl contains the same attributes as the original_dl
+        self.assertTrue(new_dl == original_dl)
+
+    def test_DL_export_after_dict_changed(self):
+        """Verify that export_to_file() writes changes made through a
+        detectors_location_dict obtained before a previous export."""
+        first_filepath = os.path.join(self.dir, '12.txt')
+        second_filepath = os.path.join(self.dir, '13.txt')
+        direction = flow_processing_input.Direction.north_bound
+        dl = flow_processing_input.DetectorsLocation(2021)
+        locations = dl.detectors_location_dict
+        locations[1] = (direction, (1.0, 2.0))
+        dl.export_to_file(first_filepath)
+        locations[2] = (direction, (3.0, 4.0))
+        dl.export_to_file(second_filepath)
+        new_dl = flow_processing_input.DetectorsLocation(9999, second_filepath)
+        # Check if the second export holds both detectors
+        self.assertEqual(new_dl.detectors_location_dict,
+                         {1: (direction, (1.0, 2.0)),
+                          2: (direction, (3.0, 4.0))})
+
+    def test_DL_export_large_ids(self):
+        """Verify that export_to_file() and __eq__ handle detector IDs
+        outside of the int32 range."""
+        filepath = os.path.join(self.dir, '16.txt')
+        direction = flow_processing_input.Direction.north_bound
+        original_dl = flow_processing_input.DetectorsLocation(2021)
+        original_dl.detectors_location_dict = {
+            2**31: (direction, (1.0, 2.0)),
+            2**40: (direction, (3.0, 4.0))}
+        original_dl.export_to_file(filepath)
+        new_dl = flow_processing_input.DetectorsLocation(9999, filepath)
+        # Check if new_dl contains the same attributes as the original_dl
+        self.assertTrue(new_dl == original_dl)
+        self.assertEqual(new_dl.detectors_location_dict,
+                         original_dl.detectors_location_dict)
+
+    def test_DL_equals_reordered_dict(self):
+        """Verify that equality does not depend on the order of
+        detectors_location_dict, but does on its items."""
+        original_dl = flow_processing_input.DetectorsLocation(2021)
+        original_dl.detectors_location_dict = createDLDataset(10).dataset
+        reordered_dl = flow_processing_input.DetectorsLocation(2021)
+        reordered_dl.detectors_location_dict = dict(
+            reversed(list(original_dl.detectors_location_dict.items())))
+        self.assertTrue(reordered_dl == original_dl)
+        # Removing one detector makes the objects unequal
+        reordered_dl.detectors_location_dict.popitem()
+        self.assertFalse(reordered_dl == original_dl)
+        self.assertFalse(original_dl == reordered_dl)
+
+    def test_DL_equals_after_change(self):
+        """Verify that __eq__ reflects a change to either object after a
+        previous comparison."""
+        original_dl = flow_processing_input.DetectorsLocation(2021)
+        original_dl.detectors_location_dict = createDLDataset(10).dataset
+        copied_dl = flow_processing_input.DetectorsLocation(2021)
+        copied_dl.detectors_location_dict = dict(
+            original_dl.detectors_location_dict)
+        self.assertTrue(original_dl == copied_dl)
+        copied_dl.year = 2020
+        self.assertFalse(original_dl == copied_dl)
+        copied_dl.year = 2021
+        self.assertTrue(original_dl == copied_dl)
+        copied_dl.detectors_location_dict.popitem()
+        self.assertFalse(original_dl == copied_dl)
+
+    def test_DL_equals_after_item_replaced(self):
+        """Verify that __eq__ reflects a location replaced in place through
+        a detectors_location_dict obtained before a previous comparison."""
+        original_dl = flow_processing_input.DetectorsLocation(2021)
+        original_dl.detectors_location_dict = createDLDataset(10).dataset
+        copied_dl = flow_processing_input.DetectorsLocation(2021)
+        copied_dl.detectors_location_dict = dict(
+            original_dl.detectors_location_dict)
+        locations = copied_dl.detectors_location_dict
+        self.assertTrue(original_dl == copied_dl)
+        self.assertTrue(copied_dl == original_dl)
+        # Check if the replaced location is compared
+        detector_id = next(iter(locations))
+        locations[detector_id] = (
+            flow_processing_input.Direction.north_bound, (-1.0, -1.0))
+        self.assertFalse(original_dl == copied_dl)
+        self.assertFalse(copied_dl == original_dl)
+
 
 class testGroundFlowData(unittest.TestCase):
     """Test the export_to_file() and _import_from_file() methods
@@ -135,25 +321,34 @@ class testGroundFlowData(unittest.TestCase):
     appropriately raised.
     """
 
+    @classmethod
+    def setUpClass(cls):
+        """Create a temporary directory for the files of all test cases."""
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        cls.dir = cls._temp_dir.name
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the temporary directory and the files in it."""
+        cls._temp_dir.cleanup()
+
     def test_GFD_export_create_file(self):
         """Verify whether export_to_file() creates a new file."""
-        filepath = '1.txt'
+        filepath = os.path.join(self.dir, '1.txt')
         gfd = flow_processing_input.GroundFlowData()
         gfd.detector_flow_data = createGFDDataset(1).dataset
         gfd.export_to_file(filepath)
         # Check if file was created at filepath
         self.assertTrue(os.path.exists(filepath))
-        os.remove(filepath)
 
     def test_GFD_import_equals_export(self):
         """Verify that export_to_file() and import_to_file() will
         return the same values."""
-        filepath = '2.txt'
+        filepath = os.path.join(self.dir, '2.txt')
         original_gfd = flow_processing_input.GroundFlowData()
         original_gfd.detector_flow_data = createGFDDataset(10).dataset
         original_gfd.export_to_file(filepath)
         new_gfd = flow_processing_input.GroundFlowData(filepath)
-        os.remove(filepath)
         # Check if new_gfd contains the same attributes as the original_gfd
         self.assertTrue(new_gfd == original_gfd)
         # Check if new_gfd is not equal to a different gfd of same size
@@ -164,7 +359,7 @@ class testGroundFlowData(unittest.TestCase):
     def test_GFD_export_existing_file(self):
         """Verify that export_to_file() raises a warning if a file
         already exists at given filepath."""
-        filepath = '3.txt'
+        filepath = os.path.join(self.dir, '3.txt')
         existing_file = open(filepath, 'x')
         existing_file.write("This file is existing.")
         existing_file.close()
@@ -174,12 +369,11 @@ class testGroundFlowData(unittest.TestCase):
         with warnings.catch_warnings(record=True) as w:
             gfd.export_to_file(filepath)
             self.assertTrue(len(w) == 1)
-        os.remove(filepath)
 
     def test_GFD_export_empty_dataset(self):
         """Verify that export_to_file() throws an exception when
         GroundFlowData object has empty detector_flow_data."""
-        filepath = '4.txt'
+        filepath = os.path.join(self.dir, '4.txt')
         empty_gfd = flow_processing_input.GroundFlowData()
         empty_gfd.detector_flow_data = createGFDDataset(0).dataset
         # Check if exception was raised for empty detector_flow_data
@@ -189,38 +383,130 @@ class testGroundFlowData(unittest.TestCase):
     def test_GFD_import_wrong_file_serialized(self):
         """Verify that _import_from_file() throws an exception when
         given file contains wrong data type."""
-        filepath = '5.txt'
+        filepath = os.path.join(self.dir, '5.txt')
         with open(filepath, 'wb') as file:
             pickle.dump(["This is a wrong dataset"], file)
         # Check if exception was raised for wrong data type
         with self.assertRaises(Exception):
             flow_processing_input.GroundFlowData(filepath)
-        os.remove(filepath)
 
     def test_GFD_import_wrong_file_unserialized(self):
         """Verify that _import_from_file() throws an exception when given
         file did not follow serialization protocols at export_to_file()."""
-        filepath = '6.txt'
+        filepath = os.path.join(self.dir, '6.txt')
         wrong_file = open(filepath, 'x')
         wrong_file.write("This is not a serialized detector flow data")
         wrong_file.close()
         # Check if exception was raised for wrong serialization
         with self.assertRaises(Exception):
             flow_processing_input.GroundFlowData(filepath)
-        os.remove(filepath)
 
     def test_GFD_import_from_constructor(self):
         """Verify that adding a filepath to the constructor imports the
         given GroundFlowData() class properly."""
-        filepath = '7.txt'
+        filepath = os.path.join(self.dir, '7.txt')
         original_gfd = flow_processing_input.GroundFlowData()
         original_gfd.detector_flow_data = createGFDDataset(10).dataset
         original_gfd.export_to_file(filepath)
         new_gfd = flow_processing_input.GroundFlowData(filepath)
-        os.remove(filepath)
         # Check if new_gfd contains the same attributes as the original_gfd
         self.assertTrue(new_gfd == original_gfd)
 
+    def test_GFD_import_plain_pickle(self):
+        """Verify that _import_from_file() still imports files holding a
+        pickled detector_flow_data without the export header."""
+        filepath = os.path.join(self.dir, '8.txt')
+        original_gfd = flow_processing_input.GroundFlowData()
+        original_gfd.detector_flow_data = createGFDDataset(10).dataset
+        with open(filepath, 'wb') as file:
+            pickle.dump(original_gfd.detector_flow_data, file)
+        new_gfd = flow_processing_input.GroundFlowData(filepath)
+        # Check if new_gfd contains the same attributes as the original_gfd
+        self.assertTrue(new_gfd == original_gfd)
+
+    def test_GFD_import_empty_list(self):
+        """Verify that _import_from_file() accepts a file holding an empty
+        list without the export header, as DetectorIdToRoadSections and
+        OutputFlowDataSet do."""
+        filepath = os.path.join(self.dir, '9.txt')
+        with open(filepath, 'wb') as file:
+            pickle.dump([], file)
+        new_gfd = flow_processing_input.GroundFlowData(filepath)
+        self.assertEqual(new_gfd.detector_flow_data, [])
+
+    def test_GFD_import_wrong_file_mixed_list(self):
+        """Verify that _import_from_file() throws an exception when given
+        file holds a list whose last item is not DetectorFlowData."""
+        filepath = os.path.join(self.dir, '11.txt')
+        with open(filepath, 'wb') as file:
+            pickle.dump(createGFDDataset(10).dataset + ['wrong'], file)
+        # Check if exception was raised for wrong data type
+        with self.assertRaises(Exception):
+            flow_processing_input.GroundFlowData(filepath)
+
+    def test_GFD_import_equals_export_compressed(self):
+        """Verify that a compressed export_to_file() is imported back by
+        _import_from_file() with the same values."""
+        filepath = os.path.join(self.dir, '10.txt')
+        original_gfd = flow_processing_input.GroundFlowData()
+        original_gfd.detector_flow_data = createGFDDataset(10).dataset
+        original_gfd.export_to_file(filepath, compress=True)
+        new_gfd = flow_processing_input.GroundFlowData(filepath)
+        # Check if new_gfd contains the same attributes as the original_gfd
+        self.assertTrue(new_gfd == original_gfd)
+
+    def test_GFD_equals_after_change(self):
+        """Verify that __eq__ reflects a changed detector_flow_data after a
+        previous comparison."""
+        original_gfd = flow_processing_input.GroundFlowData()
+        original_gfd.detector_flow_data = createGFDDataset(10).dataset
+        copied_gfd = flow_processing_input.GroundFlowData()
+        copied_gfd.detector_flow_data = list(original_gfd.detector_flow_data)
+        self.assertTrue(original_gfd == copied_gfd)
+        copied_gfd.detector_flow_data.pop()
+        self.assertFalse(original_gfd == copied_gfd)
+        copied_gfd.detector_flow_data = original_gfd.detector_flow_data[::-1]
+        self.assertFalse(original_gfd == copied_gfd)
+
+    def test_GFD_equals_after_item_replaced(self):
+        """Verify that __eq__ reflects an item of detector_flow_data
+        replaced in place after a previous comparison."""
+        original_gfd = flow_processing_input.GroundFlowData()
+        original_gfd.detector_flow_data = createGFDDataset(10).dataset
+        copied_gfd = flow_processing_input.GroundFlowData()
+        copied_gfd.detector_flow_data = list(original_gfd.detector_flow_data)
+        self.assertTrue(original_gfd == copied_gfd)
+        self.assertTrue(copied_gfd == original_gfd)
+        # Check if the replaced item is compared
+        copied_gfd.detector_flow_data[0] = (
+            flow_processing_input.DetectorFlowData.from_dict(
+                -1, flow_processing_input.Direction.north_bound, {},
+                'replaced', 2021))
+        self.assertFalse(original_gfd == copied_gfd)
+        self.assertFalse(copied_gfd == original_gfd)
+
+    def test_GFD_flow_data_as_dict(self):
+        """Verify that DetectorFlowData created from a dictionary of flows
+        returns the same dictionary."""
+        flow_data = {datetime.datetime(2021, 1, 1, 8, 30): 123.456,
+                     datetime.datetime(2021, 1, 1, 8, 45, 0, 250): 0.1}
+        detector = flow_processing_input.DetectorFlowData.from_dict(
+            1, flow_processing_input.Direction.east_bound, flow_data,
+            'detector', 2021)
+        self.assertEqual(detector.as_dict(), flow_data)
+
+    def test_GFD_flow_data_aware_timestamps(self):
+        """Verify that DetectorFlowData converts timezone-aware timestamps
+        to naive UTC timestamps."""
+        timezone = datetime.timezone(datetime.timedelta(hours=9))
+        flow_data = {datetime.datetime(2021, 1, 1, 8, 30,
+                                       tzinfo=timezone): 123.456}
+        detector = flow_processing_input.DetectorFlowData.from_dict(
+            1, flow_processing_input.Direction.east_bound, flow_data,
+            'detector', 2021)
+        self.assertEqual(detector.as_dict(),
+                         {datetime.datetime(2020, 12, 31, 23, 30): 123.456})
+
 
 class createDLDataset:
     """Generator class for DetectorsLocation's detectors_location_dict.
@@ -238,7 +524,7 @@ class createDLDataset:
     """
     dataset: Dict[flow_processing_input.DetectorId,
                   Tuple[flow_processing_input.Direction,
-                        flow_processing_input.Point]]
+                        Tuple[float, float]]]
     num_locations: int
 
     def __init__(self, num_locations):
@@ -249,33 +535,29 @@ class createDLDataset:
 
     def add_locations(self):
         """Add detectors and their locations to dataset"""
-        for _ in range(0, self.num_locations):
-            detector_id = self.generate_id()
-            detector_direction = self.generate_direction()
-            detector_point = self.generate_point()
-            self.dataset[detector_id] = (detector_direction, detector_point)
+        # Draw every detector's values in one call per attribute
+        detector_ids = self.generate_ids(self.num_locations)
+        detector_directions = self.generate_directions(self.num_locations)
+        detector_points = self.generate_points(self.num_locations)
+        self.dataset.update(zip(
+            detector_ids, zip(detector_directions, detector_points)))
         assert len(self.dataset) == self.num_locations
 
-    def generate_id(self):
-        """Generate a random ID for a detector"""
-        random_Id = flow_processing_input.DetectorId(random.randint(0, 9999))
-        assert isinstance(random_Id, flow_processing_input.DetectorId(int))
-        return random_Id
+    def generate_ids(self, num_ids):
+        """Generate num_ids unique random IDs for detectors."""
+        return random.sample(range(10000), num_ids)
 
-    def generate_direction(self):
-        """Generate a random direction for a detector."""
-        random_enum = random.randint(1, 4)
-        random_direction = flow_processing_input.Direction(random_enum)
-        assert isinstance(random_direction, flow_processing_input.Direction)
-        return random_direction
+    def generate_directions(self, num_directions):
+        """Generate num_directions random directions for detectors."""
+        return random.choices(list(flow_processing_input.Direction),
+                              k=num_directions)
 
-    def generate_point(self):
-        """Generate a random point for a detector."""
-        x = random.uniform(0.0, 9999.9)
-        y = random.uniform(0.0, 9999.9)
-        random_point = Point(x, y)
-        assert isinstance(random_point, Point)
-        return random_point
+    def generate_points(self, num_points):
+        """Generate num_points random points for detectors."""
+        coordinates = [value / 10000
+                       for value in random.choices(range(99999001),
+                                                   k=2 * num_points)]
+        return list(zip(coordinates[0::2], coordinates[1::2]))
 
 
 class createGFDDataset:
@@ -297,69 +579,77 @@ class createGFDDataset:
 
     def __init__(self, num_detectors):
         """Create dataset of size num_detectors"""
-        self.dataset = []
+        self.dataset = [None] * num_detectors
         self.num_detectors = num_detectors
         self.add_detectors()
 
     def add_detectors(self):
         """Add detectors and their attributes to dataset"""
-        for _ in range(self.num_detectors):
-            detector = flow_processing_input.DetectorFlowData()
-            detector.detector_id = self.generate_id()
-            detector.direction = self.generate_direction()
-            detector.name = self.generate_name()
-            detector.flow_data = self.generate_flowdata()
-            detector.year = 2021
-            self.dataset += [detector]
+        # Draw every detector's ID, direction, name and flow data at once
+        detector_ids = self.generate_ids(self.num_detectors)
+        detector_directions = self.generate_directions(self.num_detectors)
+        detector_names = self.generate_names(self.num_detectors)
+        detector_flowdata = self.generate_flowdata(self.num_detectors)
+        detector_flow_data = flow_processing_input.DetectorFlowData
+        self.dataset = [detector_flow_data(detector_id=detector_id,
+                                           direction=direction,
+                                           flows=flowsizes,
+                                           name=name,
+                                           timestamps=timestamps,
+                                           year=2021)
+                        for detector_id, direction, name,
+                        (timestamps, flowsizes)
+                        in zip(detector_ids, detector_directions,
+                               detector_names, detector_flowdata)]
         assert len(self.dataset) == self.num_detectors
 
-    def generate_id(self):
-        """Generate a random ID for a detector"""
-        random_Id = flow_processing_input.DetectorId(random.randint(0, 9999))
-        assert isinstance(random_Id, flow_processing_input.DetectorId(int))
-        return random_Id
-
-    def generate_direction(self):
-        """Generate a random direction for a detector."""
-        random_enum = random.randint(1, 4)
-        random_direction = flow_processing_input.Direction(random_enum)
-        assert isinstance(random_direction, flow_processing_input.Direction)
-        return random_direction
-
-    def generate_name(self):
-        """Generate a random name for a detector."""
-        letters = string.ascii_letters
-        random_name = ''.join(random.choice(letters) for _ in range(10))
-        assert isinstance(random_name, str)
-        return random_name
-
-    def generate_flowdata(self):
-        """Generate a random flow data for a detector."""
-        random_flowdata = {}
-        datasize = random.randint(0, 100)
-        for _ in range(datasize):
-            timestamp = self.generate_datetime()
-            flowsize = self.generate_flowsize()
-            random_flowdata.update({timestamp: flowsize})
-        assert isinstance(random_flowdata, dict)
-        return random_flowdata
-
-    def generate_datetime(self):
-        """Generate a random datetime for a detector's flow data."""
+    def generate_ids(self, num_ids):
+        """Generate num_ids unique random IDs for detectors."""
+        return random.sample(range(10000), num_ids)
+
+    def generate_directions(self, num_directions):
+        """Generate num_directions random directions for detectors."""
+        return random.choices(list(flow_processing_input.Direction),
+                              k=num_directions)
+
+    def generate_names(self, num_names):
+        """Generate num_names random names for detectors."""
+        letters = ''.join(random.choices(string.ascii_letters,
+                                         k=10 * num_names))
+        return [letters[i:i + 10] for i in range(0, 10 * num_names, 10)]
+
+    def generate_flowdata(self, num_detectors):
+        """Generate random flow data for num_detectors detectors, as a list
+        of (timestamps, flowsizes) tuples."""
+        # Draw the sizes, timestamps and flow sizes of all detectors at once
+        datasizes = random.choices(range(101), k=num_detectors)
+        timestamps = self.generate_timestamps(sum(datasizes))
+        flowsizes = self.generate_flowsizes(sum(datasizes))
+        # Split them into consecutive slices, one per detector
+        ends = list(itertools.accumulate(datasizes))
+        starts = [0] + ends[:-1]
+        return [(timestamps[start:end], flowsizes[start:end])
+                for start, end in zip(starts, ends)]
+
+    def generate_timestamps(self, num_timestamps):
+        """Generate num_timestamps random timestamps for detectors' flow
+        data, in microseconds since 1970-01-01 00:00:00."""
         min_year = 1980
         max_year = 2021
+        epoch = datetime.datetime(1970, 1, 1, 00, 00, 00)
         start = datetime.datetime(min_year, 1, 1, 00, 00, 00)
         years = max_year - min_year + 1
-        end = start + datetime.timedelta(days=365 * years)
-        random_datetime = start + (end - start) * random.random()
-        assert isinstance(random_datetime, datetime.datetime)
-        return random_datetime
-
-    def generate_flowsize(self):
-        """Generate a random flow size for a detector."""
-        random_flowsize = round(random.uniform(0.0, 200.0), 3)
-        assert isinstance(random_flowsize, float)
-        return random_flowsize
+        microsecond = datetime.timedelta(microseconds=1)
+        first = (start - epoch) // microsecond
+        span = datetime.timedelta(days=365 * years) // microsecond
+        return array('q', random.choices(range(first, first + span),
+                                         k=num_timestamps))
+
+    def generate_flowsizes(self, num_flowsizes):
+        """Generate num_flowsizes random flow sizes for detectors."""
+        return array('d', [value / 1000
+                           for value in random.choices(range(200001),
+                                                       k=num_flowsizes)])
 
 
 if __name__ == '__main__':